@@ -1,35 +1,128 @@
 import pandas as pd
-import re
-from rules import ENRICHMENT_RULES
+import numpy as np
+import polars as pl
+from rules import ENRICHMENT_RULES, RULE_DATABASE, RULE_LITERALS, REGEX_RULE_IDS, META
+
+def match_rule_ids(*columns):
+    """
+    Returns the id of the first rule matching each row in any of the given columns.
+    Rows without a match get len(ENRICHMENT_RULES), the id of the default enrichment in META.
+    """
+    # Transaction text repeats heavily, so only distinct values are scanned;
+    # factorize maps every row onto its distinct value (missing values get code -1).
+    # Only the distinct values are cast to text, instead of copying whole columns with astype(str)
+    factorized = [pd.factorize(column) for column in columns]
+    values = [str(value).encode() for _, uniques in factorized for value in uniques]
+
+    # Each value is scanned as its own block, so anchors and character classes
+    # cannot match across neighbouring values
+    value_rule_ids = np.full(len(values), len(ENRICHMENT_RULES), dtype=np.intp)
+
+    def on_match(rule_id, start, end, flags, index):
+        if rule_id < value_rule_ids[index]:
+            value_rule_ids[index] = rule_id
+
+    for index, value in enumerate(values):
+        RULE_DATABASE.scan(value, match_event_handler=on_match, context=index)
+
+    # A rule applies if it matches any of the columns, so keep the lowest id per row.
+    # The no-match id appended to each column's ids is what code -1 picks up.
+    rule_ids = np.full(len(columns[0]), len(ENRICHMENT_RULES), dtype=np.intp)
+    start = 0
+    for codes, uniques in factorized:
+        column_rule_ids = np.append(value_rule_ids[start:start + len(uniques)], len(ENRICHMENT_RULES))
+        rule_ids = np.minimum(rule_ids, column_rule_ids[codes])
+        start += len(uniques)
+    return rule_ids
+
+ENRICHED_COLUMNS = ['MerchantClassification', 'TransactionClassification', 'IsCreditCardExpense', 'Reason']
+
+def build_categorical_enrichment(column):
+    """
+    Returns the categorical dtype of a META column and the category code of every rule id.
+    """
+    dtype = pd.CategoricalDtype(sorted(set(META[:, column])))
+    return dtype, dtype.categories.get_indexer(META[:, column])
+
+# The string columns only ever hold one value per rule, so they are returned as categoricals
+CATEGORICAL_ENRICHMENT = {col: build_categorical_enrichment(i)
+                          for i, col in enumerate(ENRICHED_COLUMNS) if col != 'IsCreditCardExpense'}
+
+# The credit card flag is a single byte per row rather than a boxed Python int
+CREDIT_CARD_FLAGS = META[:, ENRICHED_COLUMNS.index('IsCreditCardExpense')].astype(np.uint8)
+
+def build_polars_enrichment():
+    """
+    Builds the polars expressions used by enrich_polars_transactions: the lowercased
+    text columns, the rule id of each row and one META lookup per enriched column.
+    """
+    # Text is lowercased once up front, so lowercase patterns can skip case-insensitive matching
+    lowercase_text = [pl.col(col).cast(pl.String).str.to_lowercase().alias(f'{col}Lower')
+                      for col in ['TransactionName', 'NormalizedEntity']]
+
+    # Literal rules: one Aho-Corasick pass per column finds every rule word in the text,
+    # and the lowest rule id among them is the first matching literal rule
+    rule_matches = [pl.lit(None, dtype=pl.Int64)]
+    if RULE_LITERALS:
+        rule_matches += [
+            pl.col(f'{col}Lower').str.extract_many(list(RULE_LITERALS), overlapping=True)
+            .list.eval(pl.element().replace_strict(RULE_LITERALS, return_dtype=pl.Int64)).list.min()
+            for col in ['TransactionName', 'NormalizedEntity']
+        ]
+
+    # Any other rule still runs as a regex on both columns
+    for i in REGEX_RULE_IDS:
+        pattern = ENRICHMENT_RULES[i][0]
+        if pattern != pattern.lower():
+            pattern = f'(?i){pattern}'
+        matched = (pl.col('TransactionNameLower').str.contains(pattern)
+                   | pl.col('NormalizedEntityLower').str.contains(pattern))
+        rule_matches.append(pl.when(matched).then(i))
+
+    # The first matching rule wins; rows matching nothing get the default enrichment
+    rule_id = pl.min_horizontal(rule_matches).fill_null(len(ENRICHMENT_RULES))
+
+    rule_ids = list(range(len(META)))
+    enrichment = []
+    for i, col in enumerate(ENRICHED_COLUMNS):
+        return_dtype = pl.Enum(CATEGORICAL_ENRICHMENT[col][0].categories) if col in CATEGORICAL_ENRICHMENT else pl.UInt8
+        enrichment.append(pl.col('RuleId').replace_strict(rule_ids, list(META[:, i]), return_dtype=return_dtype).alias(col))
+    return lowercase_text, rule_id.alias('RuleId'), enrichment
+
+# Rule patterns are turned into expressions once at import and reused for every frame
+POLARS_LOWERCASE_TEXT, POLARS_RULE_ID, POLARS_ENRICHMENT = build_polars_enrichment()
+
+def enrich_polars_transactions(df):
+    """
+    Polars counterpart of enrich_transactions, evaluated as a single lazy query.
+    Rules are matched by Polars' multi-threaded Aho-Corasick and regex engines.
+    """
+    return (
+        df.lazy()
+        .with_columns(POLARS_LOWERCASE_TEXT)
+        .with_columns(POLARS_RULE_ID)
+        .with_columns(POLARS_ENRICHMENT)
+        .drop('TransactionNameLower', 'NormalizedEntityLower', 'RuleId')
+        .collect()
+    )
 
 def enrich_transactions(df):
     """
     Applies ordered regex rules to enrich transaction data with classifications and reasons.
     Rules are priority-based (first match wins).
+    Accepts a pandas or a polars DataFrame and returns the same kind.
     """
+    if isinstance(df, pl.DataFrame):
+        return enrich_polars_transactions(df)
+
+    # A rule applies if it matches either 'TransactionName' or 'NormalizedEntity'
+    rule_ids = match_rule_ids(df['TransactionName'], df['NormalizedEntity'])
 
-    # Initialize new columns
-    df['MerchantClassification'] = 'other'
-    df['TransactionClassification'] = 'other'
-    df['IsCreditCardExpense'] = 0
-    df['Reason'] = 'no rule matched'
-
-    # Apply rules sequentially
-    for pattern, merchant_class, transaction_class, is_credit_card, reason in ENRICHMENT_RULES:
-        # Create a mask for rows where the rule has not been applied yet
-        unmatched_mask = (df['Reason'] == 'no rule matched')
-
-        # Check 'TransactionName' and 'NormalizedEntity'
-        match_name = df['TransactionName'].astype(str).str.contains(pattern, case=False, na=False, regex=True)
-        match_entity = df['NormalizedEntity'].astype(str).str.contains(pattern, case=False, na=False, regex=True)
-        
-        # Combine matches and apply only to unmatched rows
-        matched_rows = unmatched_mask & (match_name | match_entity)
-
-        df.loc[matched_rows, 'MerchantClassification'] = merchant_class
-        df.loc[matched_rows, 'TransactionClassification'] = transaction_class
-        df.loc[matched_rows, 'IsCreditCardExpense'] = is_credit_card
-        df.loc[matched_rows, 'Reason'] = reason
+    # Gather all enrichment values for every row in one pass; categorical columns
+    # are built straight from their category codes
+    for col, (dtype, rule_codes) in CATEGORICAL_ENRICHMENT.items():
+        df[col] = pd.Categorical.from_codes(rule_codes[rule_ids], dtype=dtype)
+    df['IsCreditCardExpense'] = CREDIT_CARD_FLAGS[rule_ids]
 
     # TODO: Implement spaCy fallback for unclassified transactions
     # If 'Reason' is still 'no rule matched', apply spaCy-based classification here.
@@ -1,12 +1,29 @@
+import re
 import pandas as pd
-import numpy as np
+import polars as pl
 from enrichment import enrich_transactions
 
+# Input columns, based on the assumed input structure
+DATE_COLS = ['TransactionDate']
+AMOUNT_COL = 'TransactionAmountUSD'
+DESCRIPTION_COLS = ['TransactionName', 'NormalizedEntity']
+
+# Output column names
+SIGNED_AMOUNT_COL = 'SignedAmount'
+
+# Expected final schema, validated at the end of both preprocessing pipelines
+EXPECTED_COLUMNS = DATE_COLS + DESCRIPTION_COLS + [AMOUNT_COL, SIGNED_AMOUNT_COL, 'TransactionClassification', 'MerchantClassification', 'IsCreditCardExpense']
+NUMERIC_COLS = [AMOUNT_COL, SIGNED_AMOUNT_COL, 'IsCreditCardExpense']
+
+# Noise stripped from the description columns by default
+NOISE_PATTERNS = ['electronic', 'web auth']
+
 def read_data(file_path):
     """
     Reads the Excel file into a pandas DataFrame.
+    Uses the Rust-based calamine engine rather than parsing the sheet XML in Python with openpyxl.
     """
-    df = pd.read_excel(file_path)
+    df = pd.read_excel(file_path, engine='calamine')
     return df
 
 def parse_dates(df, date_columns):
@@ -22,8 +39,7 @@ def fix_excel_overflow(df, numeric_columns):
     Fixes Excel overflow cells ('########') by coercing to numeric safely.
     """
     for col in numeric_columns:
-        # Replace '########' with NaN and then convert to numeric
-        df[col] = df[col].replace('########', np.nan)
+        # errors='coerce' already turns '########' (and any other unparseable cell) into NaN
         df[col] = pd.to_numeric(df[col], errors='coerce')
     return df
 
@@ -40,21 +56,44 @@ def normalize_text_fields(df, text_columns, noise_patterns=None):
     Normalizes text fields by lowercasing and stripping specified noise patterns.
     """
     if noise_patterns is None:
-        noise_patterns = ['electronic', 'web auth']
+        noise_patterns = NOISE_PATTERNS
+
+    # All noise patterns are stripped in a single pass over each column
+    noise_regex = re.compile('|'.join(map(re.escape, noise_patterns)))
 
     for col in text_columns:
-        df[col] = df[col].astype(str).str.lower().str.strip()
-        for pattern in noise_patterns:
-            df[col] = df[col].str.replace(pattern, '', regex=False).str.strip()
+        df[col] = df[col].astype(str).str.lower().str.replace(noise_regex, '', regex=True).str.strip()
     return df
 
-def flag_credit_debit(df, amount_col, credit_flag_col, debit_flag_col):
+def is_credit(df, amount_col=SIGNED_AMOUNT_COL):
     """
-    Flags transactions as credit or debit based on the signed amount.
+    Returns a boolean mask of credit transactions (positive signed amount).
+    Derived on demand instead of being stored as a column.
     """
-    df[credit_flag_col] = (df[amount_col] > 0).astype(int)
-    df[debit_flag_col] = (df[amount_col] < 0).astype(int)
-    return df
+    return df[amount_col].to_numpy() > 0
+
+def is_debit(df, amount_col=SIGNED_AMOUNT_COL):
+    """
+    Returns a boolean mask of debit transactions (negative signed amount).
+    Derived on demand instead of being stored as a column.
+    """
+    return df[amount_col].to_numpy() < 0
+
+def is_numeric_column(df, col):
+    """
+    Checks whether a pandas or polars column is numeric. Booleans count as numeric, as in pandas.
+    """
+    if isinstance(df, pl.DataFrame):
+        return df.schema[col].is_numeric() or df.schema[col] == pl.Boolean
+    return pd.api.types.is_numeric_dtype(df[col])
+
+def is_datetime_column(df, col):
+    """
+    Checks whether a pandas or polars column holds datetimes.
+    """
+    if isinstance(df, pl.DataFrame):
+        return df.schema[col] == pl.Datetime
+    return pd.api.types.is_datetime64_any_dtype(df[col])
 
 def validate_schema(df, expected_columns, numeric_cols, date_cols):
     """
@@ -68,10 +107,10 @@ def validate_schema(df, expected_columns, numeric_cols, date_cols):
 
     # Check for correct dtypes (basic validation)
     for col in numeric_cols:
-        if not pd.api.types.is_numeric_dtype(df[col]):
+        if not is_numeric_column(df, col):
             raise TypeError(f"Column '{col}' is not numeric.")
     for col in date_cols:
-        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+        if not is_datetime_column(df, col):
             raise TypeError(f"Column '{col}' is not datetime.")
 
     return df
@@ -80,44 +119,58 @@ def preprocess_data(file_path):
     """
     Orchestrates the preprocessing pipeline for the transaction data.
     """
-    # Define column names based on assumed input structure
-    date_cols = ['TransactionDate']
-    amount_col = 'TransactionAmountUSD'
-    description_cols = ['TransactionName', 'NormalizedEntity']
-
-    # Define output column names
-    new_amount_col = 'SignedAmount'
-    credit_flag_col = 'IsCredit'
-    debit_flag_col = 'IsDebit'
-    
     # 1. Read Data
     df = read_data(file_path)
 
     # 2. Parse Dates
-    df = parse_dates(df, date_cols)
-
-
-    # 5. Normalize text fields
-    # Assign the existing amount column to new_amount_col as it's already signed
-    df[new_amount_col] = df[amount_col]
+    df = parse_dates(df, DATE_COLS)
 
-    # 3. Normalize text fields
-    df = normalize_text_fields(df, description_cols)
+    # 3. Signed amount
+    # Assign the existing amount column to the signed amount column as it's already signed
+    df[SIGNED_AMOUNT_COL] = df[AMOUNT_COL]
 
-    # 4. Flag credit vs debit
-    df = flag_credit_debit(df, new_amount_col, credit_flag_col, debit_flag_col)
+    # 4. Normalize text fields
+    df = normalize_text_fields(df, DESCRIPTION_COLS)
 
-    # 6. Flag credit vs debit
-    df = flag_credit_debit(df, new_amount_col, credit_flag_col, debit_flag_col)
+    # 5. Validate and enforce a clean, consistent schema
+    df = validate_schema(df, EXPECTED_COLUMNS, NUMERIC_COLS, DATE_COLS)
 
-    # Define the expected final schema for validation
-    expected_columns = date_cols + description_cols + [amount_col, new_amount_col, credit_flag_col, debit_flag_col, 'TransactionClassification', 'MerchantClassification', 'IsCreditCardExpense']
-    numeric_cols = [amount_col, new_amount_col, credit_flag_col, debit_flag_col, 'IsCreditCardExpense']
+    return df
 
-    # 7. Validate and enforce a clean, consistent schema
-    df = validate_schema(df, expected_columns, numeric_cols, date_cols)
+def preprocess_polars_data(file_path, noise_patterns=None):
+    """
+    Polars counterpart of preprocess_data, returning a polars DataFrame.
+    Every step after reading runs as a single fused lazy query instead of one pass per step.
+    Missing text stays null rather than becoming the string 'nan' (as astype(str) does before
+    pandas 3), and 'N/A' cells are kept as text where pandas reads them as missing.
+    """
+    if noise_patterns is None:
+        noise_patterns = NOISE_PATTERNS
 
-    return df
+    # 1. Read Data
+    df = pl.read_excel(file_path)
+
+    # Text dates are parsed, native dates only need widening to datetime
+    date_exprs = [pl.col(col).str.to_datetime(strict=False) if df.schema[col] == pl.String else pl.col(col).cast(pl.Datetime)
+                  for col in DATE_COLS]
+
+    df = (
+        df.lazy()
+        .with_columns(
+            # 2. Parse dates
+            *date_exprs,
+            # 3. Normalize text fields
+            *[pl.col(col).cast(pl.String).str.to_lowercase()
+              .str.replace_many({pattern: '' for pattern in noise_patterns}).str.strip_chars()
+              for col in DESCRIPTION_COLS],
+            # 4. Signed amount; the amount column is already signed
+            pl.col(AMOUNT_COL).alias(SIGNED_AMOUNT_COL),
+        )
+        .collect()
+    )
+
+    # 5. Validate and enforce a clean, consistent schema
+    return validate_schema(df, EXPECTED_COLUMNS, NUMERIC_COLS, DATE_COLS)
 
 if __name__ == "__main__":
     # Example usage:
@@ -1,5 +1,9 @@
 # rules.py
 
+import hyperscan
+
+import numpy as np
+
 # Define ordered regex rules for transaction enrichment.
 # Each rule is a tuple: (regex_pattern, merchant_class, transaction_class, is_credit_card, reason)
 # Regex will be applied to both 'TransactionName' and 'NormalizedEntity' in a case-insensitive manner.
@@ -38,3 +42,47 @@ ENRICHMENT_RULES = [
     (r'education|school', 'education', 'education', 0, 'education matched'),
 ]
 
+# Enrichment applied to rows that no rule matches. It is stored as the last row of
+# META, so rule id len(ENRICHMENT_RULES) means "no rule matched".
+DEFAULT_ENRICHMENT = ('other', 'other', 0, 'no rule matched')
+
+# All rules compiled once at import into a single Hyperscan database. A scan reports
+# every (rule id, match end offset) pair in one pass over the text, so the lowest
+# rule id matched within a row is the first-match-wins rule.
+RULE_DATABASE = hyperscan.Database()
+RULE_DATABASE.compile(
+    expressions=[rule[0].encode() for rule in ENRICHMENT_RULES],
+    ids=list(range(len(ENRICHMENT_RULES))),
+    elements=len(ENRICHMENT_RULES),
+    flags=[hyperscan.HS_FLAG_CASELESS] * len(ENRICHMENT_RULES),
+)
+
+# Characters that make a pattern more than a plain alternation of words
+REGEX_SYNTAX = set('.^$*+?{}[]\\|()')
+
+def extract_literals(pattern):
+    """
+    Returns the lowercased alternatives of a pattern that is a plain alternation of words,
+    optionally wrapped in a single group. Returns None for any other regex.
+    """
+    if pattern.startswith('(') and pattern.endswith(')'):
+        pattern = pattern[1:-1]
+    literals = pattern.split('|')
+    if any(not literal or REGEX_SYNTAX & set(literal) for literal in literals):
+        return None
+    return [literal.lower() for literal in literals]
+
+# Literal rules can be matched with one Aho-Corasick search over all their words
+# (literal -> first rule using it); the remaining rules still need a regex scan.
+RULE_LITERALS = {}
+REGEX_RULE_IDS = []
+for i, rule in enumerate(ENRICHMENT_RULES):
+    literals = extract_literals(rule[0])
+    if literals is None:
+        REGEX_RULE_IDS.append(i)
+    else:
+        for literal in literals:
+            RULE_LITERALS.setdefault(literal, i)
+
+# (merchant_class, transaction_class, is_credit_card, reason) indexed by rule id.
+META = np.array([rule[1:] for rule in ENRICHMENT_RULES] + [DEFAULT_ENRICHMENT], dtype=object)
@@ -0,0 +1,60 @@
+import warnings
+import numpy as np
+import pandas as pd
+import polars as pl
+from rules import ENRICHMENT_RULES, META
+from enrichment import match_rule_ids, enrich_transactions
+
+def baseline_rule_ids(df):
+    """
+    The original per-rule str.contains cascade: the first matching rule wins and missing text never matches.
+    """
+    rule_ids = np.full(len(df), len(ENRICHMENT_RULES))
+    unmatched = np.ones(len(df), dtype=bool)
+    with warnings.catch_warnings():
+        # Rule patterns carry match groups, which str.contains warns about
+        warnings.simplefilter('ignore', UserWarning)
+        for i, rule in enumerate(ENRICHMENT_RULES):
+            match_name = df['TransactionName'].str.contains(rule[0], case=False, na=False, regex=True)
+            match_entity = df['NormalizedEntity'].str.contains(rule[0], case=False, na=False, regex=True)
+            matched = unmatched & (match_name | match_entity).to_numpy()
+            rule_ids[matched] = i
+            unmatched &= ~matched
+    return rule_ids
+
+# Covers missing values, repeated values, rows where the two columns match different rules,
+# several rules within one value (priority beats position) and values without any match
+TRANSACTIONS = pd.DataFrame({
+    'TransactionName': ['amazon visa', None, 'PayPal transfer', 'starbucks', 'current rent', np.nan,
+                        'grocery', 'albertsons', '', 'amazon visa', 'gas', 'station', 'café netflix'],
+    'NormalizedEntity': ['ebay', 'gym', 'visa', np.nan, 'hotel', None,
+                         'netflix', 'albertsons', 'school', 'x', 'station', 'gas', 'über'],
+}, index=pd.RangeIndex(100, 113))
+
+def test_match_rule_ids_matches_baseline():
+    rule_ids = match_rule_ids(TRANSACTIONS['TransactionName'], TRANSACTIONS['NormalizedEntity'])
+    np.testing.assert_array_equal(rule_ids, baseline_rule_ids(TRANSACTIONS))
+
+def test_match_rule_ids_priority_and_missing_values():
+    rule_ids = match_rule_ids(TRANSACTIONS['TransactionName'], TRANSACTIONS['NormalizedEntity'])
+    # 'visa' (rule 0) wins over 'amazon' (rule 2) although it appears later in the text
+    assert rule_ids[0] == 0
+    # 'visa' in the entity wins over 'paypal' (rule 1) in the name
+    assert rule_ids[2] == 0
+    # Missing in both columns
+    assert rule_ids[5] == len(ENRICHMENT_RULES)
+    # Words split over neighbouring values do not match
+    assert rule_ids[10] == len(ENRICHMENT_RULES) and rule_ids[11] == len(ENRICHMENT_RULES)
+
+def test_match_rule_ids_empty():
+    empty = TRANSACTIONS.iloc[:0]
+    assert len(match_rule_ids(empty['TransactionName'], empty['NormalizedEntity'])) == 0
+
+def test_enrich_transactions_pandas_and_polars_agree():
+    expected = META[baseline_rule_ids(TRANSACTIONS)]
+    columns = ['MerchantClassification', 'TransactionClassification', 'IsCreditCardExpense', 'Reason']
+    pandas_df = enrich_transactions(TRANSACTIONS.copy())
+    polars_df = enrich_transactions(pl.from_pandas(TRANSACTIONS))
+    for i, col in enumerate(columns):
+        assert pandas_df[col].astype(str).tolist() == [str(value) for value in expected[:, i]]
+        assert polars_df[col].cast(pl.String).to_list() == [str(value) for value in expected[:, i]]
@@ -0,0 +1,90 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import polars as pl
+import pytest
+from preprocessing import preprocess_data, preprocess_polars_data, validate_schema, is_credit, is_debit, normalize_text_fields, DESCRIPTION_COLS
+
+@pytest.fixture
+def workbook(tmp_path):
+    """
+    A small transactions workbook with noise, mixed case, missing text and an 'N/A' cell.
+    """
+    pytest.importorskip('openpyxl')
+    path = tmp_path / 'transactions.xlsx'
+    pd.DataFrame({
+        'TransactionDate': [datetime(2025, 1, 2), datetime(2025, 3, 4), datetime(2025, 5, 6), datetime(2025, 7, 8)],
+        'TransactionAmountUSD': [12.5, -40.0, 0.0, -3.25],
+        'TransactionClassification': ['Refunds', 'General Expenses', 'Income', 'General Expenses'],
+        'MerchantClassification': ['eBay', 'Starbucks', 'Employer', 'Shell'],
+        'TransactionName': ['ELECTRONIC Payroll Deposit', ' Web Auth Starbucks ', None, 'Shell fuel'],
+        'NormalizedEntity': ['Acme', 'starbucks', 'Acme', 'N/A'],
+        'IsCreditCardExpense': [False, True, False, True],
+    }).to_excel(path, index=False, engine='openpyxl')
+    return path
+
+def test_polars_pipeline_matches_pandas_pipeline(workbook):
+    pandas_df = preprocess_data(workbook)
+    polars_df = preprocess_polars_data(workbook)
+    assert list(pandas_df.columns) == polars_df.columns
+
+    for col in pandas_df.columns:
+        expected = [None if pd.isna(value) else value for value in pandas_df[col].tolist()]
+        actual = polars_df[col].to_list()
+        if col in DESCRIPTION_COLS:
+            # Documented differences: 'N/A' is kept as text, where pandas reads it as missing
+            actual = [None if value == 'n/a' else value for value in actual]
+        assert actual == expected, col
+
+    # Missing text stays null in polars
+    assert polars_df['TransactionName'].to_list()[2] is None
+    assert polars_df['TransactionName'].to_list()[:2] == ['payroll deposit', 'starbucks']
+
+def test_validate_schema_rejects_polars_dtypes():
+    df = pl.DataFrame({'SignedAmount': ['1.0'], 'TransactionDate': ['2025-01-01'], 'IsCreditCardExpense': [True]})
+    # Booleans count as numeric, like in pandas
+    validate_schema(df, ['IsCreditCardExpense'], ['IsCreditCardExpense'], [])
+    with pytest.raises(TypeError, match="'SignedAmount' is not numeric"):
+        validate_schema(df, ['SignedAmount'], ['SignedAmount'], [])
+    with pytest.raises(TypeError, match="'TransactionDate' is not datetime"):
+        validate_schema(df, ['TransactionDate'], [], ['TransactionDate'])
+
+@pytest.mark.parametrize('frame', [pd.DataFrame, pl.DataFrame])
+def test_credit_debit_masks(frame):
+    amounts = [12.5, -40.0, 0.0, np.nan, -0.0, 3.0]
+    df = frame({'SignedAmount': amounts})
+    # Zero and missing amounts are neither credit nor debit
+    np.testing.assert_array_equal(is_credit(df), [True, False, False, False, False, True])
+    np.testing.assert_array_equal(is_debit(df), [False, True, False, False, False, False])
+    np.testing.assert_array_equal(is_credit(df), np.array(amounts) > 0)
+    np.testing.assert_array_equal(is_debit(df), np.array(amounts) < 0)
+
+def test_credit_debit_masks_polars_nulls():
+    df = pl.DataFrame({'SignedAmount': [None, 5.0, -5.0]})
+    np.testing.assert_array_equal(is_credit(df), [False, True, False])
+    np.testing.assert_array_equal(is_debit(df), [False, False, True])
+
+def test_normalize_text_fields_default_noise():
+    df = pd.DataFrame({'TransactionName': ['ELECTRONIC Payroll', ' Web Auth Starbucks ', 'Shell'],
+                       'NormalizedEntity': ['acme electronic', 'WEB AUTH', 'n/a']})
+    df = normalize_text_fields(df, DESCRIPTION_COLS)
+    assert df['TransactionName'].tolist() == ['payroll', 'starbucks', 'shell']
+    assert df['NormalizedEntity'].tolist() == ['acme', '', 'n/a']
+
+def test_normalize_text_fields_single_pass():
+    # Noise left behind by removing another pattern is not removed again
+    df = normalize_text_fields(pd.DataFrame({'TransactionName': ['web electronicauth store']}), ['TransactionName'])
+    assert df['TransactionName'].tolist() == ['web auth store']
+
+@pytest.mark.parametrize('noise_patterns, expected', [
+    # The first listed alternative wins where patterns overlap
+    (['web', 'web auth'], ['auth starbucks', 'authorize', 'caf.e']),
+    (['web auth', 'web'], ['starbucks', 'authorize', 'caf.e']),
+    # Patterns are literal text, not regexes
+    (['.'], ['web auth starbucks', 'webauthorize', 'cafe']),
+    ([], ['web auth starbucks', 'webauthorize', 'caf.e']),
+])
+def test_normalize_text_fields_custom_noise(noise_patterns, expected):
+    df = pd.DataFrame({'TransactionName': ['Web Auth Starbucks', 'webAuthorize', 'caf.e']})
+    df = normalize_text_fields(df, ['TransactionName'], noise_patterns)
+    assert df['TransactionName'].tolist() == expected